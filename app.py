@@ -17,172 +17,601 @@
 
 import streamlit as st
 import pandas as pd
+import os
+import io
 import time
 import re
+import json
+from difflib import SequenceMatcher
+from urllib.parse import urlsplit
 import threading
+import asyncio
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import queue
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+import collections
 import math
-import google.generativeai as genai
+import atexit
+import concurrent.futures
 
 # --- Page Configuration ---
 st.set_page_config(page_title="AI-Powered Attorney Verification", page_icon="🤖", layout="wide")
 
-# --- State Management & Thread-Safe Queue ---
-if 'log_queue' not in st.session_state: st.session_state.log_queue = queue.Queue()
-if 'results_queue' not in st.session_state: st.session_state.results_queue = queue.Queue()
-if 'progress_queue' not in st.session_state: st.session_state.progress_queue = queue.Queue()
+# --- State Management & Thread-Safe Handoff ---
+# deque.append/popleft are atomic, so the worker and the UI share these without locks.
+# The progress slot only ever holds the latest (processed, total, finished) tuple.
+if 'log_queue' not in st.session_state: st.session_state.log_queue = collections.deque()
+if 'results_queue' not in st.session_state: st.session_state.results_queue = collections.deque()
+if 'progress_slot' not in st.session_state: st.session_state.progress_slot = [(0, 0, False)]
 if 'stop_event' not in st.session_state: st.session_state.stop_event = threading.Event()
 if 'process_running' not in st.session_state: st.session_state.process_running = False
 if 'log_messages' not in st.session_state: st.session_state.log_messages = ["Welcome! Please select a state, provide an API Key, and upload a CSV to begin."]
-if 'results_df' not in st.session_state: st.session_state.results_df = pd.DataFrame()
+if 'results_list' not in st.session_state: st.session_state.results_list = []
 if 'progress' not in st.session_state: st.session_state.progress = (0, 0)
 
 # --- CONFIGURATION ---
 BATCH_SIZE = 50
+REQUIRED_COLUMNS = ['First Name', 'Last Name', 'Firm name', 'Email']
 COOL_DOWN_SECONDS = 5
 CALBAR_SEARCH_URL = 'https://apps.calbar.ca.gov/attorney/LicenseeSearch/QuickSearch'
 GABAR_SEARCH_URL = 'https://www.gabar.org/member-directory/'
-POLITE_WAIT_TIME = 2.5
+PAGE_WAIT_SECONDS = 25  # Page loads, search result tables and GA result links
+FAST_WAIT_SECONDS = 5  # Form fields on an already-loaded page
+QUEUE_DRAIN_LIMIT = 200  # Max items moved from each worker queue per UI refresh
+LOG_HISTORY_LIMIT = 500  # Activity log lines kept (and re-rendered every refresh); older lines are dropped
+WORKERS = 4  # Parallel workers for a run, each with its own headless Chrome; up to this many browsers are kept warm for the next run
+HTTP_CONCURRENCY = 20  # Max plain-HTTP requests (searches and profile pages) in flight; host pacing usually keeps far fewer active
+PROFILE_CACHE_TTL_SECONDS = 6 * 60 * 60  # How long parsed profile pages are reused across runs
+PROFILE_CACHE_MAX_ENTRIES = 2048  # Parsed profile pages kept across runs; the least recently used are dropped beyond this
+HOST_MIN_INTERVAL_SECONDS = 0.5  # Minimum gap between requests (browser or HTTP) to the same bar site, across all workers and sessions
+MAX_PROFILES_TO_CHECK = 5  # Profile pages visited per attorney before giving up on a match
+DRIVER_RECYCLE_ROWS = BATCH_SIZE  # Rows a worker's Chrome handles before it is replaced with a fresh one
+CA_RESULT_ROWS_CSS = "#tblAttorney > tbody > tr"
+GA_PROFILE_LINK_CSS = "a[href*='/member-directory/?id=']"
+GA_SEARCH_FORM_CSS = "form[action*='/member-directory/']"
+GEMINI_GENERATE_URL = 'https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent'
+BLOCKED_URL_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*hotjar.com*', '*facebook.net*', '*.woff', '*.woff2',
+]
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# --- Compiled Patterns ---
+_SUFFIX_RE = re.compile(r',?\s+(jr|sr|ii|iii|iv|esq)\.?$', re.I)
+# Emails and the "Website:" field are found in one pass over the page text
+_CONTACT_RE = re.compile(r'(?P<email>[\w.-]+@[\w.-]+)|Website:\s*(?:<a[^>]*>(?P<web_html>[^<]+)</a>|(?P<web>\S+))', re.I)
+# The GA directory's message for a search with no matching members
+_GA_NO_RESULTS_RE = re.compile(r'\bno (?:results|members|attorneys|records)(?: were)? found\b|\b0 (?:results|members)\b', re.I)
 
 # --- Helper Functions ---
 def setup_driver(log_q):
-    log_q.put("Setting up robust web driver...")
-    service = ChromeService(ChromeDriverManager().install())
+    log_q.append("Setting up robust web driver...")
+    # A pinned CHROMEDRIVER_PATH skips driver resolution entirely; otherwise Selenium Manager finds and caches one
+    service = ChromeService(os.environ.get('CHROMEDRIVER_PATH'))
     options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
     options.add_argument("start-maximized")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    options.add_argument(f"user-agent={USER_AGENT}")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_argument('--disable-blink-features=AutomationControlled')
     options.add_argument('--log-level=3')
-    return webdriver.Chrome(service=service, options=options)
-
-def definitive_clean_name(name_str):
-    if not isinstance(name_str, str): return ""
-    name_str = re.sub(r',?\s+(jr|sr|ii|iii|iv|esq)\.?$', '', name_str, flags=re.I).strip()
-    name_str = name_str.replace('.', '')
-    parts = name_str.split()
-    if not parts: return ""
-    if len(parts[0]) == 1 and len(parts) > 1:
-        return parts[1]
-    return parts[0]
-
-def get_name_parts(row):
-    first, last = row.get('First Name', ''), row.get('Last Name', '')
-    clean_last = str(last).strip().split()[0] if isinstance(last, str) and last.strip() else ""
-    return definitive_clean_name(first).lower(), clean_last.lower()
-
-def get_match_signals(name_parts, firm_name, page_text):
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-extensions')
+    # driver.get returns at DOMContentLoaded; nothing read from the page depends on subresources
+    options.page_load_strategy = 'eager'
+    # Matching only reads text and table HTML, so skip downloading images. Stylesheets must still
+    # load: innerText relies on them to leave out CSS-hidden decoys
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.cookies": 1,
+    })
+    driver = webdriver.Chrome(service=service, options=options)
+    # Analytics beacons and web fonts never affect what is read from the page
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    return driver
+
+def add_clean_name_columns(df):
+    """Adds the normalised '_first_clean', '_last_clean' and '_firm_lower' columns used for searching and matching."""
+    first_parts = (df['First Name'].fillna('').astype(str)
+                   .str.replace(_SUFFIX_RE, '', regex=True).str.replace('.', '', regex=False).str.split())
+    first_word = first_parts.str[0].fillna('').astype(str)
+    second_word = first_parts.str[1].fillna('').astype(str)
+    # A leading initial ("J. Robert Smith") is skipped in favour of the next name
+    use_second = first_word.str.len().eq(1) & second_word.ne('')
+    df['_first_clean'] = second_word.where(use_second, first_word).str.lower()
+    df['_last_clean'] = df['Last Name'].fillna('').astype(str).str.split().str[0].fillna('').astype(str).str.lower()
+    df['_firm_lower'] = df['Firm name'].fillna('').astype(str).str.strip().str.lower()
+    return df
+
+# Evaluated in the browser so a whole profile page is read in one WebDriver round-trip.
+# arguments[0] maps field names to XPaths of state-specific fields to capture.
+_PAGE_BUNDLE_JS = """
+const fields = {};
+for (const [name, xpath] of Object.entries(arguments[0])) {
+    const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    fields[name] = node ? {text: node.innerText.trim(), html: node.innerHTML} : null;
+}
+return {
+    body: document.body.innerText,
+    headings: Array.from(document.querySelectorAll('h1, h2, h3'), h => h.innerText),
+    fields: fields,
+};
+"""
+CA_PROFILE_FIELDS = {'discipline': "//table//tbody/tr[td/strong[text()='Present']]/td[3]"}
+CA_PROFILE_KEY_FIELD = 'discipline'  # The 'Present' discipline row every CA profile has
+GA_PROFILE_FIELDS = {
+    'status': "//p[span[contains(text(),'Status')]]/span[contains(@class,'fw-bold')]",
+    'discipline': "//div[span[contains(text(),'Public Discipline')]]/span[contains(@class,'fw-bold')]",
+}
+GA_PROFILE_KEY_FIELD = 'status'  # The membership status every GA profile has
+
+# The same fields for pages fetched over HTTP; selectolax has no XPath, so these walk the tree by hand.
+def _node_field(node):
+    return {'text': node.text().strip(), 'html': node.inner_html} if node else None
+
+def parse_ca_profile_fields(tree):
+    for row in tree.css('table tbody tr'):
+        cells = row.css('td')
+        if len(cells) >= 3 and any(label.text(deep=False) == 'Present' for label in row.css('td > strong')):
+            return {'discipline': _node_field(cells[2])}
+    return {'discipline': None}
+
+def _labelled_bold_span(tree, container_tag, label):
+    for node in tree.css(container_tag):
+        spans = [child for child in node.iter() if child.tag == 'span']
+        if any(label in span.text(deep=False) for span in spans):
+            bold = next((span for span in spans if 'fw-bold' in (span.attributes.get('class') or '')), None)
+            if bold: return _node_field(bold)
+    return None
+
+def parse_ga_profile_fields(tree):
+    return {'status': _labelled_bold_span(tree, 'p', 'Status'), 'discipline': _labelled_bold_span(tree, 'div', 'Public Discipline')}
+
+def _page_bundle(body_text, headings, fields):
+    page_text = body_text.lower()
+    emails, website = set(), None
+    for match in _CONTACT_RE.finditer(page_text):
+        if match.group('email'): emails.add(match.group('email'))
+        elif website is None: website = match.group('web_html') or match.group('web')
+    return {
+        'text': page_text,
+        'headings': [heading.lower() for heading in headings],
+        'emails': frozenset(emails),
+        'website': website,
+        'fields': fields,
+    }
+
+def extract_page_bundle(driver, field_xpaths):
+    """Reads a profile page once into the text, headings, emails, website and state-specific fields the matchers need."""
+    page = driver.execute_script(_PAGE_BUNDLE_JS, field_xpaths)
+    return _page_bundle(page['body'], page['headings'], page['fields'])
+
+# innerText for pages fetched over HTTP: only these elements start a new line, and only what the page's CSS shows is read
+_BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section',
+    'table', 'tbody', 'tfoot', 'thead', 'tr', 'ul',
+))
+_HIDING_CSS_RE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.I)
+_CSS_RULE_RE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_CSS_AT_BLOCK_RE = re.compile(r'@[^{};]*;|@[^{};]*\{(?:[^{}]*\{[^{}]*\})*[^{}]*\}')
+_HIDDEN_ATTR = 'data-page-bundle-hidden'
+
+def _mark_hidden_nodes(tree):
+    """Flags nodes the page's own CSS hides; CalBar pads profiles with display:none decoy emails that innerText never sees."""
+    hidden = [node for node in tree.css('[hidden], [style]') if 'hidden' in node.attributes or _HIDING_CSS_RE.search(node.attributes.get('style') or '')]
+    for style in tree.css('style'):
+        # Comments and @media/@supports blocks are dropped, so only rules that always apply are read
+        css = _CSS_AT_BLOCK_RE.sub('', re.sub(r'/\*.*?\*/', '', style.text(), flags=re.S))
+        for selectors, declarations in _CSS_RULE_RE.findall(css):
+            if not _HIDING_CSS_RE.search(declarations): continue
+            for selector in selectors.split(','):
+                try: hidden.extend(tree.css(selector.strip()))
+                except Exception: continue  # selectors lexbor can't evaluate (e.g. :hover) hide nothing at load time
+    for node in hidden: node.attrs[_HIDDEN_ATTR] = ''
+
+def _inner_text(node):
+    parts = []
+    def walk(parent):
+        for child in parent.iter(include_text=True):
+            if child.tag == '-text': parts.append(re.sub(r'\s+', ' ', child.text(deep=False)))
+            elif child.tag == 'br': parts.append('\n')
+            elif child.tag.startswith('-') or _HIDDEN_ATTR in child.attributes: continue
+            elif child.tag in ('td', 'th'):
+                walk(child)
+                parts.append('\t')
+            else:
+                block = child.tag in _BLOCK_TAGS
+                if block: parts.append('\n')
+                walk(child)
+                if block: parts.append('\n')
+    walk(node)
+    lines = (line.strip(' \t') for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+def parse_visible_html(html):
+    """Parses HTML without what innerText never shows: scripts, styles, and nodes hidden by the page's CSS (flagged, read as empty)."""
+    tree = LexborHTMLParser(html)
+    _mark_hidden_nodes(tree)
+    tree.strip_tags(['script', 'style', 'noscript'])
+    return tree
+
+def parse_page_bundle(html, field_parser):
+    """Builds the same bundle from raw profile HTML; None if the page has no headings (e.g. a bot challenge)."""
+    tree = parse_visible_html(html)
+    headings = [_inner_text(h) for h in tree.css('h1, h2, h3') if _HIDDEN_ATTR not in h.attributes]
+    if tree.body is None or not headings: return None
+    return _page_bundle(_inner_text(tree.body), headings, field_parser(tree))
+
+def is_profile_bundle(bundle, key_field):
+    """Whether a bundle is a real profile page, worth caching; challenge and error pages can have headings but not the state's key field."""
+    return bool(bundle and bundle['headings'] and bundle['fields'].get(key_field))
+
+def get_match_signals(name_parts, firm_name, bundle):
     first, last = name_parts
+    first4 = first[:4]
     signals = []
-    if firm_name and firm_name in page_text:
+    if firm_name and firm_name in bundle['text']:
         signals.append("Firm Name")
-    
-    page_emails = re.findall(r'[\w\.-]+@[\w\.-]+', page_text)
-    website_match = re.search(r'Website:\s*<a[^>]*>([^<]+)</a>', page_text, re.IGNORECASE) or re.search(r'Website:\s*(\S+)', page_text, re.IGNORECASE)
-    page_website = website_match.group(1).lower() if website_match else None
-
-    email_name_match = False
-    for email in page_emails:
-        if last in email and first[:4] in email:
-            email_name_match = True
-            break
-    if email_name_match: signals.append("Name in Email")
-    
-    website_name_match = False
-    if page_website:
-        if last in page_website and first[:4] in page_website:
-            website_name_match = True
-    if website_name_match: signals.append("Name in Website")
-            
+    if any(last in email and first4 in email for email in bundle['emails']):
+        signals.append("Name in Email")
+    page_website = bundle['website']
+    if page_website and last in page_website and first4 in page_website:
+        signals.append("Name in Website")
     return signals
 
-def is_name_only_match(name_parts, driver):
+def is_name_only_match(name_parts, bundle):
     first, last = name_parts
-    try:
-        headings = driver.find_elements(By.XPATH, "//h1 | //h2 | //h3")
-        for heading in headings:
-            if last in heading.text.lower() and first in heading.text.lower():
-                return True
-    except: return False
-    return False
-
-def get_ai_summary(api_key, raw_data, log_q):
-    """Uses Gemini to generate a final summary comment."""
-    log_q.put(" -> Generating AI summary comment...")
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Create a clean summary of the input data for the prompt
-        prompt_facts = f"""
-        - Verified Status: {raw_data.get('Verified Status', 'N/A')}
-        - Discipline Found: {raw_data.get('Discipline Found', 'N/A')}
-        - Match Signals: {', '.join(raw_data.get('Match Signals', [])) if raw_data.get('Match Signals') else 'None'}
-        - Name Only Fallback Used: {raw_data.get('Name Match Only', 'No')}
-        - Unmatched Links Found: {'Yes' if raw_data.get('Unmatched Profile Links') else 'No'}
-        """
-
-        prompt = f"""
-        You are a reporting agent. Summarize the following verification results into a single, concise sentence for a 'Comments' column in a report.
-        
-        Input Data:
-        {prompt_facts}
-
-        Task: Generate the comment. Be clear and direct.
-        Example 1: If Match Signals contains 'Firm Name', respond: "Verified: Match confirmed based on firm name. No discipline found."
-        Example 2: If Name Only Fallback is 'Yes', respond: "Verified: Name matched on profile, but no other contact/firm data was found."
-        Example 3: If Verified Status is 'Match Not Confirmed', respond: "Match Not Confirmed. See links provided for manual review."
-        Example 4: If Verified Status is 'Deceased', respond: "Result determined from search page. Profile status is Deceased."
-        """
-        response = model.generate_content(prompt)
-        summary = response.text.strip().replace('\n', ' ')
-        log_q.put(f" -> AI Comment: {summary}")
-        return summary
-    except Exception as e:
-        log_q.put(f" -> ERROR: AI summary failed: {e}")
-        return "AI summary failed."
+    return any(last in heading and first in heading for heading in bundle['headings'])
+
+def profile_matches(name_parts, firm_name, bundle):
+    """Whether the processors would accept this profile: any match signal, or the name-only fallback."""
+    return bool(get_match_signals(name_parts, firm_name, bundle)) or is_name_only_match(name_parts, bundle)
+
+@st.cache_data(show_spinner=False)
+def load_csv(file_bytes):
+    """Parses an upload once per distinct file and, when the required columns are present, adds the clean name columns."""
+    # Only the required columns are parsed, all as text, so wide exports stay small and names are never coerced to numbers
+    # Blank cells become '' so rows hand plain strings to the workers and results never show "nan"
+    df = pd.read_csv(io.BytesIO(file_bytes), usecols=lambda col: col in REQUIRED_COLUMNS, dtype=str).fillna('')
+    if all(col in df.columns for col in REQUIRED_COLUMNS): df = add_clean_name_columns(df)
+    return df
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_client(api_key):
+    # One pooled HTTP/2 connection per API key, kept alive across requests and runs
+    return httpx.Client(
+        http2=True, timeout=30.0, headers={'x-goog-api-key': api_key},
+        limits=httpx.Limits(max_keepalive_connections=8),
+    )
+
+def gemini_generate_json(client, prompt):
+    """Sends a prompt to Gemini and returns the text of the first candidate, requested as JSON."""
+    resp = client.post(GEMINI_GENERATE_URL, json={
+        'contents': [{'parts': [{'text': prompt}]}],
+        'generationConfig': {'responseMimeType': 'application/json'},
+    })
+    resp.raise_for_status()
+    return resp.json()['candidates'][0]['content']['parts'][0]['text']
+
+def _summary_facts(raw_data):
+    return {
+        'Verified Status': raw_data.get('Verified Status', 'N/A'),
+        'Discipline Found': raw_data.get('Discipline Found', 'N/A'),
+        'Match Signals': ', '.join(raw_data.get('Match Signals', [])) if raw_data.get('Match Signals') else 'None',
+        'Name Only Fallback Used': raw_data.get('Name Match Only', 'No'),
+        'Unmatched Links Found': 'Yes' if raw_data.get('Unmatched Profile Links') else 'No',
+    }
+
+# Comments for outcomes that need no AI judgement, keyed by 'Verified Status'
+_STATIC_SUMMARIES = {
+    'Not Found on CalBar': "Attorney not found in the CalBar directory.",
+    'Not Found on GA Bar': "Attorney not found in the GA Bar directory.",
+    'Search Error (CA)': "Search error occurred; manual review required.",
+    'Match Not Confirmed': "Match Not Confirmed. See links provided for manual review.",
+}
+
+def get_static_summary(raw_data):
+    """Returns a fixed comment for deterministic outcomes, or None when the AI should write one."""
+    status, discipline = raw_data.get('Verified Status'), raw_data.get('Discipline Found')
+    if status in _STATIC_SUMMARIES: return _STATIC_SUMMARIES[status]
+    if discipline == 'Match Not Confirmed': return _STATIC_SUMMARIES['Match Not Confirmed']
+    if discipline == 'Not Applicable (Non-Active)': return f"Result determined from search page. Profile status is {status}."
+    if discipline == 'No':
+        if 'Firm Name' in (raw_data.get('Match Signals') or []): return "Verified: Match confirmed based on firm name. No discipline found."
+        if raw_data.get('Name Match Only') == 'Yes': return "Verified: Name matched on profile, but no other contact/firm data was found."
+    return None
+
+def _summary_key(raw_data):
+    return tuple(_summary_facts(raw_data).items())
+
+# Comments already generated this run, keyed by fact pattern. Most rows collapse to
+# a handful of patterns ("Not Found", "Match Not Confirmed", ...), so the key space is small.
+_summary_cache = {}
+
+def get_ai_summaries_batch(client, raw_data_list, log_q):
+    """Uses a single Gemini call to generate a summary comment for every new fact pattern in a batch."""
+    keys = [_summary_key(raw_data) for raw_data in raw_data_list]
+    missing = list(dict.fromkeys(key for key in keys if key not in _summary_cache))
+    if missing:
+        log_q.append(f" -> Generating {len(missing)} AI summary comment(s) in one request ({len(keys) - len(missing)} reused)...")
+        try:
+            prompt = f"""
+            You are a reporting agent. Summarize each of the following verification results into a single, concise sentence for a 'Comments' column in a report.
+            
+            Input Data (one JSON object per attorney):
+            {json.dumps([dict(key) for key in missing], indent=2)}
+
+            Task: Return a JSON list of exactly {len(missing)} strings, one comment per input object, in the same order. Be clear and direct.
+            Example 1: If Match Signals contains 'Firm Name', respond: "Verified: Match confirmed based on firm name. No discipline found."
+            Example 2: If Name Only Fallback is 'Yes', respond: "Verified: Name matched on profile, but no other contact/firm data was found."
+            Example 3: If Verified Status is 'Match Not Confirmed', respond: "Match Not Confirmed. See links provided for manual review."
+            Example 4: If Verified Status is 'Deceased', respond: "Result determined from search page. Profile status is Deceased."
+            """
+            summaries = json.loads(gemini_generate_json(client, prompt))
+            if not isinstance(summaries, list) or len(summaries) != len(missing):
+                raise ValueError(f"expected {len(missing)} comments, got {len(summaries) if isinstance(summaries, list) else type(summaries).__name__}")
+            for key, summary in zip(missing, summaries):
+                _summary_cache[key] = str(summary).strip().replace('\n', ' ')
+            log_q.append(f" -> AI Comments generated for {len(missing)} fact pattern(s).")
+        except Exception as e:
+            log_q.append(f" -> ERROR: AI summary failed: {e}")
+    return [_summary_cache.get(key, "AI summary failed.") for key in keys]
+
+# --- HTTP SEARCH (no browser) ---
+# Both bar search pages are server-rendered, so the results can be fetched and
+# parsed without Chrome. Each fetcher returns None when the response does not
+# look like a results page; the caller then falls back to the browser search.
+
+@st.cache_resource(show_spinner=False)
+def _host_schedule():
+    """Next free request slot per host, and its lock; one per process, so every run and session shares it."""
+    return {}, threading.Lock()
+
+def _host_delay(url):
+    """Reserves the next request slot for url's host; returns the seconds to wait before using it.
+
+    Browser workers and the HTTP prefetch of every session share one schedule per host, so neither more
+    workers, more concurrent requests nor more users raise the rate a bar site sees."""
+    host = urlsplit(url).netloc
+    next_slot, lock = _host_schedule()
+    with lock:
+        now = time.monotonic()
+        slot = max(now, next_slot.get(host, 0.0))
+        next_slot[host] = slot + HOST_MIN_INTERVAL_SECONDS
+    return slot - now
+
+async def fetch_calbar(client, first, last):
+    resp = await client.get(CALBAR_SEARCH_URL, params={'FreeText': f"{first} {last}"})
+    resp.raise_for_status()
+    tree = LexborHTMLParser(resp.text)
+    no_results = tree.css_first('.attSearchRes')
+    if no_results and "returned no results" in no_results.text(): return []
+    rows = tree.css(CA_RESULT_ROWS_CSS)
+    if not rows: return None
+    search_rows = []
+    for r in rows:
+        cells = r.css('td')
+        if len(cells) < 2: continue
+        link = cells[0].css_first('a')
+        href = str(resp.url.join(link.attributes.get('href') or '')) if link else None
+        search_rows.append({'name': cells[0].text(strip=True), 'status': cells[1].text(strip=True), 'href': href})
+    return search_rows
+
+async def fetch_gabar(client, first, last):
+    resp = await client.get(GABAR_SEARCH_URL, params={'firstName': first, 'lastName': last})
+    resp.raise_for_status()
+    tree = parse_visible_html(resp.text)
+    links = tree.css(GA_PROFILE_LINK_CSS)
+    if not links:
+        # An empty result is only trusted when the directory's own search page visibly says so; anything else goes to the browser
+        on_directory_page = tree.body is not None and tree.css_first(GA_SEARCH_FORM_CSS) is not None
+        return [] if on_directory_page and _GA_NO_RESULTS_RE.search(_inner_text(tree.body)) else None
+    return [str(resp.url.join(a.attributes.get('href') or '')) for a in links]
+
+async def fetch_profile_bundle(client, url, field_parser):
+    resp = await client.get(url)
+    resp.raise_for_status()
+    return parse_page_bundle(resp.text, field_parser)
+
+def ca_active_profile_links(search_rows, name_parts):
+    """Active profile links, closest listed name ("Smith, John A") first so the likely match is visited before the rest."""
+    first, last = name_parts
+    target = f"{last} {first}"
+    active = [r for r in search_rows if r['status'].lower() == 'active' and r['href']]
+    active.sort(key=lambda r: -SequenceMatcher(None, r.get('name', '').lower().replace(',', ''), target).ratio())
+    return [r['href'] for r in active]
+
+def profiles_to_check(links):
+    """Unique profile links in search order, capped at MAX_PROFILES_TO_CHECK."""
+    return list(dict.fromkeys(links))[:MAX_PROFILES_TO_CHECK]
+
+class ProfileCache:
+    """Parsed profile pages by URL; bounded to max_entries by least-recent use, and each entry expires ttl seconds after it was stored."""
+    def __init__(self, max_entries, ttl):
+        self.max_entries, self.ttl = max_entries, ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            expires, bundle = self._entries.get(url, (0.0, None))
+            if bundle is None: return None
+            if expires < time.monotonic():
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return bundle
+
+    def __setitem__(self, url, bundle):
+        with self._lock:
+            self._entries[url] = (time.monotonic() + self.ttl, bundle)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+@st.cache_resource(show_spinner=False)
+def get_profile_cache():
+    # Shared across runs and sessions so a retried or overlapping CSV doesn't refetch the same profiles
+    return ProfileCache(PROFILE_CACHE_MAX_ENTRIES, PROFILE_CACHE_TTL_SECONDS)
+
+def make_http_client():
+    return httpx.AsyncClient(
+        headers={'User-Agent': USER_AGENT}, timeout=25, follow_redirects=True,
+        http2=True, limits=httpx.Limits(max_connections=HTTP_CONCURRENCY),
+    )
+
+async def prefetch_batch(client, selected_state, attorneys, profile_cache, search_cache, log_q):
+    """Runs every search in the batch over HTTP, then loads the profile pages the processors will visit.
+
+    attorneys holds (name parts, firm) per row. Returns (search results per row, {profile url: page bundle});
+    anything missing is done in the browser. Each distinct name is searched once: searches already in
+    search_cache (keyed by name parts) and profiles already in profile_cache are not refetched, and new
+    successful results are added to them."""
+    is_california = selected_state.lower() == 'california'
+    fetcher = fetch_calbar if is_california else fetch_gabar
+    field_parser = parse_ca_profile_fields if is_california else parse_ga_profile_fields
+    key_field = CA_PROFILE_KEY_FIELD if is_california else GA_PROFILE_KEY_FIELD
+    semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+    search_url = CALBAR_SEARCH_URL if is_california else GABAR_SEARCH_URL
+    async def guarded(url, fetch, *args):
+        async with semaphore:
+            delay = _host_delay(url)
+            if delay > 0: await asyncio.sleep(delay)
+            try: return await fetch(client, *args)
+            except Exception as e:
+                # Network, status and parsing failures alike only send this lookup to the browser
+                log_q.append(f" -> HTTP fetch of {url} failed ({type(e).__name__}: {e}); using the browser instead.")
+                return None
+    async def search_one(first, last):
+        return await guarded(search_url, fetcher, first, last) if last else None
+    name_parts_list = [parts for parts, _ in attorneys]
+    # Rows that share a name (e.g. the same attorney listed under two firms) share one search
+    to_search = [parts for parts in dict.fromkeys(name_parts_list) if parts not in search_cache]
+    found = await asyncio.gather(*[search_one(first, last) for first, last in to_search])
+    search_cache.update((parts, result) for parts, result in zip(to_search, found) if result is not None)
+    search_results = [search_cache.get(parts) for parts in name_parts_list]
+
+    # Profiles are loaded in the order the processors visit them: each row's best-ranked link first, and its
+    # next link only while nothing has matched, so most rows cost a single profile request
+    links_per_row = [
+        profiles_to_check(ca_active_profile_links(r, parts) if is_california else r) if r else []
+        for parts, r in zip(name_parts_list, search_results)
+    ]
+    bundles = {}
+    pending = [i for i, links in enumerate(links_per_row) if links]
+    for depth in range(MAX_PROFILES_TO_CHECK):
+        if not pending: break
+        wanted = list(dict.fromkeys(links_per_row[i][depth] for i in pending))
+        to_fetch = [url for url in wanted if profile_cache.get(url) is None]
+        fetched = await asyncio.gather(*[guarded(url, fetch_profile_bundle, url, field_parser) for url in to_fetch])
+        for url, bundle in zip(to_fetch, fetched):
+            if is_profile_bundle(bundle, key_field): profile_cache[url] = bundle
+        for url in wanted:
+            bundle = profile_cache.get(url)
+            if bundle is not None: bundles[url] = bundle
+        # A row goes one link deeper only past a profile that loaded and didn't match; from a missing one on, the browser takes over
+        pending = [
+            i for i in pending
+            if depth + 1 < len(links_per_row[i]) and links_per_row[i][depth] in bundles
+            and not profile_matches(*attorneys[i], bundles[links_per_row[i][depth]])
+        ]
+    return search_results, bundles
 
 # --- STATE-SPECIFIC LOGIC ---
-def process_california_attorney(driver, wait, attorney_data, result_data, log_q):
-    first_name_match, last_name_match = attorney_data['name_parts']
-    firm_name = attorney_data['firm']
-    log_q.put(f" -> [CA] Searching for '{first_name_match} {last_name_match}'...")
-    driver.get(CALBAR_SEARCH_URL)
-    search_box = wait.until(EC.element_to_be_clickable((By.ID, "FreeText")))
+def polite_get(driver, url):
+    delay = _host_delay(url)
+    if delay > 0: time.sleep(delay)
+    driver.get(url)
+
+def wait_for_page_ready(wait):
+    # 'interactive' is enough: the DOM is parsed, which is all the page bundle reads
+    wait.until(lambda d: d.execute_script("return document.readyState") != 'loading')
+
+def load_profile_with_browser(driver, wait, url, field_xpaths):
+    polite_get(driver, url)
+    wait_for_page_ready(wait)
+    return extract_page_bundle(driver, field_xpaths)
+
+def get_profile_bundle(browser, url, field_xpaths, key_field, profile_cache):
+    # Pages loaded in the browser join the shared cache too, so a profile is never loaded twice;
+    # anything that isn't a real profile (a challenge or error page) is used once but never cached
+    bundle = profile_cache.get(url)
+    if bundle is None:
+        driver, wait, _ = browser()
+        bundle = load_profile_with_browser(driver, wait, url, field_xpaths)
+        if is_profile_bundle(bundle, key_field): profile_cache[url] = bundle
+    return bundle
+
+# Collects (status, profile link) for every results row in one WebDriver round-trip
+_CA_RESULT_ROWS_JS = """
+return Array.from(document.querySelectorAll(arguments[0]), r => {
+    const link = r.cells[0] ? r.cells[0].querySelector('a') : null;
+    return {
+        name: r.cells[0] ? r.cells[0].innerText.trim() : '',
+        status: r.cells[1] ? r.cells[1].innerText.trim() : '',
+        href: link ? link.href : null,
+    };
+});
+"""
+
+def search_calbar_with_browser(driver, wait, fast_wait, first_name_match, last_name_match):
+    polite_get(driver, CALBAR_SEARCH_URL)
+    search_box = fast_wait.until(EC.element_to_be_clickable((By.ID, "FreeText")))
     search_box.clear()
     search_box.send_keys(f"{first_name_match} {last_name_match}")
-    wait.until(EC.element_to_be_clickable((By.ID, "btn_quicksearch"))).click()
-    time.sleep(POLITE_WAIT_TIME)
+    fast_wait.until(EC.element_to_be_clickable((By.ID, "btn_quicksearch"))).click()
+    wait.until(EC.any_of(
+        EC.visibility_of_element_located((By.ID, "tblAttorney")),
+        EC.presence_of_element_located((By.CLASS_NAME, "attSearchRes")),
+    ))
     try:
         if "returned no results" in driver.find_element(By.CLASS_NAME, "attSearchRes").text:
-            result_data['Verified Status'] = 'Not Found on CalBar'
-            return result_data
+            return []
     except NoSuchElementException: pass
 
+    wait.until(EC.visibility_of_element_located((By.ID, "tblAttorney")))
+    return driver.execute_script(_CA_RESULT_ROWS_JS, CA_RESULT_ROWS_CSS)
+
+# Non-active CA statuses, most significant first; the top one found is reported
+STATUS_HIERARCHY = ('deceased', 'disbarred', 'resigned', 'suspended', 'inactive')
+_STATUS_RANK = {status: rank for rank, status in enumerate(STATUS_HIERARCHY)}
+
+def process_california_attorney(browser, attorney_data, result_data, log_q):
+    first_name_match, last_name_match = attorney_data['name_parts']
+    firm_name = attorney_data['firm']
+    search_rows = attorney_data.get('search_results')
     try:
-        wait.until(EC.visibility_of_element_located((By.ID, "tblAttorney")))
-        result_rows = driver.find_elements(By.XPATH, "//table[@id='tblAttorney']/tbody/tr")
-        all_statuses = [r.find_element(By.XPATH, "./td[2]").text.strip() for r in result_rows]
-        active_profile_links = [r.find_element(By.XPATH, "./td[1]/a").get_attribute('href') for i, r in enumerate(result_rows) if all_statuses[i].lower() == 'active']
+        if search_rows is None:
+            log_q.append(f" -> [CA] Searching for '{first_name_match} {last_name_match}'...")
+            search_rows = search_calbar_with_browser(*browser(), first_name_match, last_name_match)
+        if not search_rows:
+            result_data['Verified Status'] = 'Not Found on CalBar'
+            return result_data
+
+        all_statuses = [r['status'] for r in search_rows]
+        active_profile_links = ca_active_profile_links(search_rows, attorney_data['name_parts'])
         
         if active_profile_links:
             result_data['Verified Status'] = 'Active'
             match_found = False
-            for link in active_profile_links:
-                driver.get(link)
-                time.sleep(1.5)
-                page_text = driver.find_element(By.TAG_NAME, 'body').text.lower()
+            links_to_check = profiles_to_check(active_profile_links)
+            if len(links_to_check) < len(set(active_profile_links)):
+                log_q.append(f" -> [CA] {len(set(active_profile_links))} active profiles found; checking the first {len(links_to_check)}.")
+            for link in links_to_check:
+                page_bundle = get_profile_bundle(browser, link, CA_PROFILE_FIELDS, CA_PROFILE_KEY_FIELD, attorney_data['profile_bundles'])
                 
-                match_signals = get_match_signals(attorney_data['name_parts'], firm_name, page_text)
+                match_signals = get_match_signals(attorney_data['name_parts'], firm_name, page_bundle)
                 name_match_only = False
-                if not match_signals and is_name_only_match(attorney_data['name_parts'], driver):
+                if not match_signals and is_name_only_match(attorney_data['name_parts'], page_bundle):
                     match_signals.append("Name Only Fallback")
                     name_match_only = True
                 
@@ -191,24 +620,19 @@ def process_california_attorney(driver, wait, attorney_data, result_data, log_q)
                     result_data['Profile Link'] = link
                     result_data['Match Signals'] = match_signals
                     result_data['Name Match Only'] = 'Yes' if name_match_only else 'No'
-                    try:
-                        xpath = "//table//tbody/tr[td/strong[text()='Present']]/td[3]"
-                        cell_html = driver.find_element(By.XPATH, xpath).get_attribute('innerHTML')
-                        result_data['Discipline Found'] = 'No' if '&nbsp;' in cell_html else 'Yes'
-                    except: result_data['Discipline Found'] = 'Discipline Info Not Found (CA)'
+                    discipline_cell = page_bundle['fields']['discipline']
+                    if discipline_cell: result_data['Discipline Found'] = 'No' if '&nbsp;' in discipline_cell['html'] else 'Yes'
+                    else: result_data['Discipline Found'] = 'Discipline Info Not Found (CA)'
                     break
             if not match_found:
                 result_data['Discipline Found'] = 'Match Not Confirmed'
-                result_data['Unmatched Profile Links'] = " | ".join(active_profile_links)
+                result_data['Unmatched Profile Links'] = " | ".join(links_to_check)
         else:
-            status_hierarchy = ['deceased', 'disbarred', 'resigned', 'suspended', 'inactive']
-            best_status = "Not Found"
-            for status in sorted(list(set(all_statuses)), key=lambda s: status_hierarchy.index(s.lower()) if s.lower() in status_hierarchy else len(status_hierarchy)):
-                best_status = status
-                break
+            unique_statuses = set(all_statuses)
+            best_status = min(unique_statuses, key=lambda s: _STATUS_RANK.get(s.lower(), len(_STATUS_RANK)))
             result_data['Verified Status'] = best_status
-            if len(set(all_statuses)) > 1:
-                result_data['Comments'] = f"Multiple non-active statuses found: {', '.join(sorted(list(set(all_statuses))))}"
+            if len(unique_statuses) > 1:
+                result_data['Comments'] = f"Multiple non-active statuses found: {', '.join(sorted(unique_statuses))}"
             result_data['Discipline Found'] = 'Not Applicable (Non-Active)'
 
     except (NoSuchElementException, TimeoutException):
@@ -216,43 +640,59 @@ def process_california_attorney(driver, wait, attorney_data, result_data, log_q)
     
     return result_data
 
-def process_georgia_attorney(driver, wait, attorney_data, result_data, log_q):
-    first_name_match, last_name_match = attorney_data['name_parts']
-    firm_name = attorney_data['firm']
-    log_q.put(f" -> [GA] Searching for '{first_name_match} {last_name_match}'...")
-    driver.get(GABAR_SEARCH_URL)
-    time.sleep(2)
+# Fills and submits the GA search form in one round-trip; returns the submit button so the caller can wait for it to go stale
+_GA_SUBMIT_SEARCH_JS = """
+document.getElementsByName('firstName')[0].value = arguments[0];
+document.getElementsByName('lastName')[0].value = arguments[1];
+const button = document.querySelector(arguments[2] + " button[type='submit']");
+button.click();
+return button;
+"""
+_GA_PROFILE_HREFS_JS = "return Array.from(document.querySelectorAll(arguments[0]), a => a.href);"
+
+def search_gabar_with_browser(driver, wait, fast_wait, first_name_match, last_name_match):
+    polite_get(driver, GABAR_SEARCH_URL)
 
     try:
-        first_name_input = wait.until(EC.presence_of_element_located((By.NAME, "firstName")))
-        driver.execute_script("arguments[0].value = arguments[1];", first_name_input, first_name_match)
-        last_name_input = driver.find_element(By.NAME, "lastName")
-        driver.execute_script("arguments[0].value = arguments[1];", last_name_input, last_name_match)
-        search_button = driver.find_element(By.XPATH, "//form[contains(@action, '/member-directory/')]//button[@type='submit']")
-        driver.execute_script("arguments[0].click();", search_button)
-        time.sleep(2.5)
-    except Exception as e:
+        fast_wait.until(EC.presence_of_element_located((By.NAME, "firstName")))
+        search_button = driver.execute_script(_GA_SUBMIT_SEARCH_JS, first_name_match, last_name_match, GA_SEARCH_FORM_CSS)
+        wait.until(EC.staleness_of(search_button))
+        wait_for_page_ready(wait)
+    except WebDriverException as e:
         raise Exception(f"Failed during GA search form interaction: {e}")
     
-    profile_urls = []
+    # Results get the full page wait; the directory's no-results message ends it early for attorneys who aren't listed
     try:
-        wait.until(EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/member-directory/?id=')]")))
-        profile_links = driver.find_elements(By.XPATH, "//a[contains(@href, '/member-directory/?id=')]")
-        profile_urls = [link.get_attribute('href') for link in profile_links]
-    except (NoSuchElementException, TimeoutException):
+        wait.until(EC.any_of(
+            EC.presence_of_element_located((By.CSS_SELECTOR, GA_PROFILE_LINK_CSS)),
+            lambda d: _GA_NO_RESULTS_RE.search(d.find_element(By.TAG_NAME, "body").text),
+        ))
+        return driver.execute_script(_GA_PROFILE_HREFS_JS, GA_PROFILE_LINK_CSS)
+    except TimeoutException:
+        return []
+
+def process_georgia_attorney(browser, attorney_data, result_data, log_q):
+    first_name_match, last_name_match = attorney_data['name_parts']
+    firm_name = attorney_data['firm']
+    profile_urls = attorney_data.get('search_results')
+    if profile_urls is None:
+        log_q.append(f" -> [GA] Searching for '{first_name_match} {last_name_match}'...")
+        profile_urls = search_gabar_with_browser(*browser(), first_name_match, last_name_match)
+    if not profile_urls:
         result_data['Verified Status'] = 'Not Found on GA Bar'
         return result_data
 
     match_found = False
-    log_q.put(f" -> [GA] Checking {len(profile_urls)} profile(s)...")
-    for url in profile_urls:
-        driver.get(url)
-        time.sleep(1.5)
-        page_text = driver.find_element(By.TAG_NAME, 'body').text.lower()
+    urls_to_check = profiles_to_check(profile_urls)
+    if len(urls_to_check) < len(set(profile_urls)):
+        log_q.append(f" -> [GA] {len(set(profile_urls))} profiles found; checking the first {len(urls_to_check)}.")
+    log_q.append(f" -> [GA] Checking {len(urls_to_check)} profile(s)...")
+    for url in urls_to_check:
+        page_bundle = get_profile_bundle(browser, url, GA_PROFILE_FIELDS, GA_PROFILE_KEY_FIELD, attorney_data['profile_bundles'])
         
-        match_signals = get_match_signals(attorney_data['name_parts'], firm_name, page_text)
+        match_signals = get_match_signals(attorney_data['name_parts'], firm_name, page_bundle)
         name_match_only = False
-        if not match_signals and is_name_only_match(attorney_data['name_parts'], driver):
+        if not match_signals and is_name_only_match(attorney_data['name_parts'], page_bundle):
             match_signals.append("Name Only Fallback")
             name_match_only = True
         
@@ -261,84 +701,233 @@ def process_georgia_attorney(driver, wait, attorney_data, result_data, log_q):
             result_data['Profile Link'] = url
             result_data['Match Signals'] = match_signals
             result_data['Name Match Only'] = 'Yes' if name_match_only else 'No'
-            try:
-                status_xpath = "//p[span[contains(text(),'Status')]]/span[contains(@class,'fw-bold')]"
-                result_data['Verified Status'] = driver.find_element(By.XPATH, status_xpath).text.strip()
-            except: result_data['Verified Status'] = "Status Not Found (GA)"
-            try:
-                discipline_xpath = "//div[span[contains(text(),'Public Discipline')]]/span[contains(@class,'fw-bold')]"
-                result_data['Discipline Found'] = driver.find_element(By.XPATH, discipline_xpath).text.strip()
-            except: result_data['Discipline Found'] = "Discipline Info Not Found (GA)"
+            status_field, discipline_field = page_bundle['fields']['status'], page_bundle['fields']['discipline']
+            result_data['Verified Status'] = status_field['text'] if status_field else "Status Not Found (GA)"
+            result_data['Discipline Found'] = discipline_field['text'] if discipline_field else "Discipline Info Not Found (GA)"
             break
             
     if not match_found:
         result_data['Verified Status'] = 'Match Not Confirmed'
-        result_data['Unmatched Profile Links'] = " | ".join(profile_urls)
+        result_data['Unmatched Profile Links'] = " | ".join(urls_to_check)
         
     return result_data
 
+# --- WORKER POOL ---
+# A WebDriver must never be shared between threads, so every pool thread owns
+# its own headless Chrome, launched the first time one of its rows needs it. Threads (not processes) are used because the
+# functions defined in a Streamlit script are replaced on every rerun and
+# cannot be pickled reliably into a multiprocessing.Pool.
+_worker_state = threading.local()
+# driver -> rows that used it; the count travels with the driver so recycling still applies when it is reused by a later run
+_worker_drivers = {}
+_worker_drivers_lock = threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _idle_drivers():
+    """Warm (driver, rows) pairs handed back by finished runs, picked up by the next run's workers."""
+    return collections.deque()
+
+def _take_idle_driver():
+    idle = _idle_drivers()
+    while True:
+        try: driver, rows = idle.popleft()
+        except IndexError: return None, 0
+        if _driver_alive(driver): return driver, rows
+        _quit_driver(driver)
+
+def _init_worker_driver(log_q):
+    driver, rows = _take_idle_driver()
+    if driver is None:
+        driver = setup_driver(log_q)
+        atexit.register(driver.quit)
+    _worker_state.driver = driver
+    _worker_state.wait = WebDriverWait(driver, PAGE_WAIT_SECONDS, poll_frequency=0.25)
+    _worker_state.fast_wait = WebDriverWait(driver, FAST_WAIT_SECONDS, poll_frequency=0.25)
+    with _worker_drivers_lock: _worker_drivers[driver] = rows
+
+def _start_worker():
+    _worker_state.driver = None
+    _worker_state.used_browser = False
+
+def _worker_browser(log_q):
+    """This worker's (driver, wait, fast_wait), launching or recycling Chrome on a row's first use of it.
+
+    Rows answered entirely over HTTP never call this, so they neither need a working Chrome nor count
+    towards recycling; a failed launch raises and fails only the row that asked for the browser."""
+    if not _worker_state.used_browser:
+        # Workers recycle one at a time as they hit the limit, so the pool never restarts all at once
+        driver = _worker_state.driver
+        if driver is not None and _worker_drivers.get(driver, 0) >= DRIVER_RECYCLE_ROWS:
+            _drop_worker_driver(log_q, f"Recycling browser after {DRIVER_RECYCLE_ROWS} rows")
+        if _worker_state.driver is None: _init_worker_driver(log_q)
+        _worker_state.used_browser = True
+    return _worker_state.driver, _worker_state.wait, _worker_state.fast_wait
+
+def _quit_driver(driver):
+    atexit.unregister(driver.quit)
+    try: driver.quit()
+    except Exception: pass
+
+def _release_worker_drivers():
+    """Parks this run's browsers for the next run with cookies and storage wiped; dead or surplus ones are quit."""
+    with _worker_drivers_lock:
+        drivers = list(_worker_drivers.items())
+        _worker_drivers.clear()
+    idle = _idle_drivers()
+    for driver, rows in drivers:
+        if len(idle) < WORKERS and rows < DRIVER_RECYCLE_ROWS:
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+                driver.get('about:blank')
+                idle.append((driver, rows))
+                continue
+            except WebDriverException: pass
+        _quit_driver(driver)
+
+def _driver_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except WebDriverException: return False
+
+def _drop_worker_driver(log_q, reason):
+    # The next row that needs the browser launches a fresh one
+    driver, _worker_state.driver = _worker_state.driver, None
+    with _worker_drivers_lock: _worker_drivers.pop(driver, None)
+    _quit_driver(driver)
+    log_q.append(f" -> {reason}; replacing this worker's driver...")
+
+def _row_identity(row, state_label):
+    return {'Name': f"{row.get('First Name', '')} {row.get('Last Name', '')}".strip(), 'State': state_label, 'Firm Name': row.get('Firm name', '')}
+
+def _error_result(row, state_label):
+    return {
+        **_row_identity(row, state_label),
+        'Verified Status': 'Error Processing', 'Discipline Found': 'Not Checked',
+        'Profile Link': 'Not Found', 'Unmatched Profile Links': ''
+    }
+
+def _process_row(index, row, search_results, profile_cache, total_records, state_label, process_attorney, log_q, stop_event):
+    if stop_event.is_set(): return None
+    # A row's log lines are buffered and published together, so parallel workers don't interleave them
+    row_log = []
+    _worker_state.used_browser = False
+    try:
+        return _verify_row(index, row, search_results, profile_cache, total_records, state_label, process_attorney, row_log)
+    finally:
+        driver = _worker_state.driver
+        if _worker_state.used_browser and driver in _worker_drivers: _worker_drivers[driver] += 1
+        log_q.extend(row_log)
+
+def _verify_row(index, row, search_results, profile_cache, total_records, state_label, process_attorney, row_log):
+    result_data = _error_result(row, state_label)
+    row_log.append(f"Processing {index + 1}/{total_records}: {result_data['Name']}")
+    try:
+        attorney_data = {
+            'name_parts': (row['_first_clean'], row['_last_clean']),
+            'firm': row['_firm_lower'],
+            'search_results': search_results,
+            'profile_bundles': profile_cache,
+        }
+        result_data = process_attorney(lambda: _worker_browser(row_log), attorney_data, result_data, row_log)
+    except Exception as e:
+        row_log.append(f"CRITICAL ERROR processing row: {e}")
+        result_data['Comments'] = f"A critical error occurred: {e}"
+        driver = _worker_state.driver
+        if driver is not None and not _driver_alive(driver): _drop_worker_driver(row_log, "Browser session lost")
+        return result_data, False
+    # The AI summary comment is generated later, once per batch
+    return result_data, True
+
+def _publish_batch(batch_results, rows_by_key, state_label, gemini_client, log_q, results_q):
+    """Fills in deterministic comments directly, asks the AI about the rest in one request, then emits every row."""
+    pending = []
+    for result_data, needs_summary, _ in batch_results:
+        if not needs_summary: continue
+        static_comment = get_static_summary(result_data)
+        if static_comment: result_data['Comments'] = static_comment
+        else: pending.append(result_data)
+    for result_data, comment in zip(pending, get_ai_summaries_batch(gemini_client, pending, log_q)):
+        result_data['Comments'] = comment
+    # Each duplicate gets its own copy at its own upload position, so the report keeps the CSV's row order
+    rows = sorted(((row, result_data) for result_data, _, key in batch_results for row in rows_by_key[key]), key=lambda pair: pair[0]['_row'])
+    for row, result_data in rows: results_q.append({**result_data, **_row_identity(row, state_label), '_row': row['_row']})
+
 # --- MAIN THREAD ---
-def verification_thread_target(uploaded_file, selected_state, api_key, log_q, results_q, progress_q, stop_event):
-    driver = None
+def verification_thread_target(file_bytes, selected_state, api_key, log_q, results_q, progress_slot, stop_event):
+    # One event loop and HTTP/2 client serve every batch, so connections to the bar sites stay warm between batches
+    http_runner = asyncio.Runner()
+    http_client = make_http_client()
     try:
-        df = pd.read_csv(uploaded_file)
+        df = load_csv(file_bytes)
         total_records = len(df)
-        progress_q.put((0, total_records))
-        required_cols = ['First Name', 'Last Name', 'Firm name', 'Email']
-        if not all(col in df.columns for col in required_cols):
-            log_q.put(f"ERROR: CSV is missing required columns: {', '.join(required_cols)}")
+        progress_slot[0] = (0, total_records, False)
+        if not all(col in df.columns for col in REQUIRED_COLUMNS):
+            log_q.append(f"ERROR: CSV is missing required columns: {', '.join(REQUIRED_COLUMNS)}")
             return
 
-        num_batches = math.ceil(total_records / BATCH_SIZE)
-        for batch_num in range(num_batches):
-            if stop_event.is_set(): break
-            driver = setup_driver(log_q)
-            if driver is None: break
-
-            start_index = batch_num * BATCH_SIZE
-            end_index = start_index + BATCH_SIZE
-            batch_df = df[start_index:end_index]
-            log_q.put(f"--- Starting Batch {batch_num + 1} of {num_batches} ---")
+        # Identical attorneys are verified once and the result is copied to every matching row
+        df['_row'] = range(total_records)
+        df['_key'] = df['_first_clean'] + '|' + df['_last_clean'] + '|' + df['_firm_lower']
+        rows_by_key = {}
+        for row in df.to_dict('records'): rows_by_key.setdefault(row['_key'], []).append(row)
+        unique_df = df.drop_duplicates('_key')
+        total_unique = len(unique_df)
+        if total_unique < total_records:
+            log_q.append(f"Skipping {total_records - total_unique} duplicate row(s); verifying {total_unique} unique attorney(s).")
 
-            for index, row in batch_df.iterrows():
+        # Resolved once per run rather than re-derived for every row
+        state_label = selected_state.upper()
+        process_attorney = process_california_attorney if selected_state.lower() == 'california' else process_georgia_attorney
+        gemini_client = get_gemini_client(api_key)
+        profile_cache = get_profile_cache()
+        search_cache = {}
+        processed = 0
+        num_batches = math.ceil(total_unique / BATCH_SIZE)
+        summary_jobs = []
+        # The pool (and each worker's Chrome) lives for the whole run; batches only pace the work
+        with concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS, initializer=_start_worker) as pool, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=1) as summary_pool:
+            for batch_num in range(num_batches):
                 if stop_event.is_set(): break
-                progress_q.put((index + 1, total_records))
-                original_name = f"{row.get('First Name', '')} {row.get('Last Name', '')}"
-                log_q.put(f"Processing {index + 1}/{total_records}: {original_name}")
-
-                result_data = {
-                    'Name': original_name, 'State': selected_state.upper(), 'Firm Name': row.get('Firm name', ''),
-                    'Verified Status': 'Error Processing', 'Discipline Found': 'Not Checked',
-                    'Profile Link': 'Not Found', 'Unmatched Profile Links': ''
+
+                start_index = batch_num * BATCH_SIZE
+                end_index = start_index + BATCH_SIZE
+                batch_df = unique_df[start_index:end_index]
+                log_q.append(f"--- Starting Batch {batch_num + 1} of {num_batches} ({WORKERS} workers) ---")
+
+                # Fetch the batch's searches and profile pages concurrently over HTTP; searches that
+                # could not be resolved this way (None) and missing profiles are loaded in the browser.
+                batch_rows = batch_df.to_dict('records')
+                search_results, profile_bundles = http_runner.run(prefetch_batch(http_client, selected_state, [((row['_first_clean'], row['_last_clean']), row['_firm_lower']) for row in batch_rows], profile_cache, search_cache, log_q))
+                log_q.append(f" -> Resolved {sum(r is not None for r in search_results)}/{len(batch_rows)} searches and {len(profile_bundles)} profile page(s) over HTTP.")
+
+                batch_results = []
+                futures = {
+                    pool.submit(_process_row, position, row, search, profile_cache, total_unique, state_label, process_attorney, log_q, stop_event): row['_key']
+                    for position, row, search in zip(range(start_index, end_index), batch_rows, search_results)
                 }
-                try:
-                    attorney_data = {
-                        'name_parts': get_name_parts(row),
-                        'firm': str(row.get('Firm name', '')).strip().lower(),
-                    }
-                    wait = WebDriverWait(driver, 25)
-                    if selected_state.lower() == 'california':
-                        result_data = process_california_attorney(driver, wait, attorney_data, result_data, log_q)
-                    elif selected_state.lower() == 'georgia':
-                         result_data = process_georgia_attorney(driver, wait, attorney_data, result_data, log_q)
-                    
-                    # Generate AI summary comment after processing
-                    result_data['Comments'] = get_ai_summary(api_key, result_data, log_q)
-
-                except Exception as e:
-                    log_q.put(f"CRITICAL ERROR processing row: {e}")
-                    result_data['Comments'] = f"A critical error occurred: {e}"
-                
-                results_q.put(result_data)
-            
-            if driver: driver.quit()
-            if batch_num < num_batches - 1 and not stop_event.is_set():
-                log_q.put(f"--- Batch {batch_num + 1} complete. Cooling down for {COOL_DOWN_SECONDS}s... ---")
-                time.sleep(COOL_DOWN_SECONDS)
+                for future in concurrent.futures.as_completed(futures):
+                    outcome = future.result()
+                    if outcome is None: continue
+                    batch_results.append((*outcome, futures[future]))
+                    processed += len(rows_by_key[futures[future]])
+                    progress_slot[0] = (processed, total_records, False)
+
+                # Comments are written on a separate thread so the next batch can start scraping meanwhile
+                summary_jobs.append(summary_pool.submit(_publish_batch, batch_results, rows_by_key, state_label, gemini_client, log_q, results_q))
+
+                if batch_num < num_batches - 1 and not stop_event.is_set():
+                    log_q.append(f"--- Batch {batch_num + 1} complete. Cooling down for {COOL_DOWN_SECONDS}s... ---")
+                    time.sleep(COOL_DOWN_SECONDS)
+            for job in summary_jobs: job.result()
     finally:
-        if 'driver' in locals() and driver: driver.quit()
-        log_q.put("Verification process finished.")
-        progress_q.put(('done', 'done'))
+        _release_worker_drivers()
+        http_runner.run(http_client.aclose())
+        http_runner.close()
+        log_q.append("Verification process finished.")
+        progress_slot[0] = progress_slot[0][:2] + (True,)
 
 # --- UI LAYOUT ---
 st.title("🤖 AI-Powered Attorney Verification Dashboard")
@@ -354,77 +943,108 @@ uploaded_file = st.sidebar.file_uploader(
     help="Required headers: 'First Name', 'Last Name', 'Firm name', 'Email'"
 )
 
-if st.sidebar.button("Start Verification", disabled=not uploaded_file or not api_key or st.session_state.process_running):
+# Button callbacks run before the script re-executes, so the click's own rerun already
+# renders the new state and no extra st.rerun() is needed
+def start_verification(uploaded_file, selected_state, api_key):
     st.session_state.process_running = True
-    st.session_state.log_messages = [f"Starting verification for {selected_state.upper()}..."]
-    st.session_state.results_df = pd.DataFrame()
+    st.session_state.log_messages = collections.deque([f"Starting verification for {selected_state.upper()}..."], maxlen=LOG_HISTORY_LIMIT)
+    st.session_state.results_list = []
+    st.session_state.pop('results_csv', None)
     st.session_state.progress = (0, 0)
     st.session_state.stop_event.clear()
-    for q in [st.session_state.log_queue, st.session_state.results_queue, st.session_state.progress_queue]:
-        while not q.empty(): q.get()
+    st.session_state.log_queue.clear()
+    st.session_state.results_queue.clear()
+    st.session_state.progress_slot[0] = (0, 0, False)
     
     thread = threading.Thread(
         target=verification_thread_target,
-        args=(uploaded_file, selected_state, api_key, st.session_state.log_queue, st.session_state.results_queue, st.session_state.progress_queue, st.session_state.stop_event)
+        args=(uploaded_file.getvalue(), selected_state, api_key, st.session_state.log_queue, st.session_state.results_queue, st.session_state.progress_slot, st.session_state.stop_event)
     )
     thread.start()
-    st.rerun()
 
-if st.sidebar.button("Stop Process", disabled=not st.session_state.process_running):
+def stop_verification():
     st.session_state.stop_event.set()
-    st.rerun()
-
-st.sidebar.info("A Chrome window will run in the background. Please do not close it.")
-
-col1, col2 = st.columns([1, 2])
-with col1:
-    st.subheader("📊 Progress")
-    current_progress, total_progress = st.session_state.progress
-    progress_bar = st.progress(0)
-    progress_text = st.empty()
-    if total_progress > 0:
-        percent_complete = int((current_progress / total_progress) * 100) if total_progress > 0 else 0
-        progress_bar.progress(percent_complete)
-        progress_text.text(f"Processed {current_progress} of {total_progress} ({percent_complete}%)")
-    else: progress_text.text("Waiting to start...")
-
-with col2:
-    st.subheader("📝 Activity Log")
-    log_placeholder = st.empty()
-    with log_placeholder.container(height=300):
-        for msg in reversed(st.session_state.log_messages):
-            st.write(msg)
-
-st.divider()
-st.subheader("✅ Results")
-results_placeholder = st.empty()
-if not st.session_state.results_df.empty:
-    # Display only a subset of columns for a cleaner UI
-    display_cols = ['Name', 'State', 'Firm Name', 'Verified Status', 'Discipline Found', 'Comments', 'Profile Link', 'Unmatched Profile Links']
-    display_df = st.session_state.results_df[[col for col in display_cols if col in st.session_state.results_df.columns]]
-    results_placeholder.dataframe(display_df)
-    
-    @st.cache_data
-    def convert_df_to_csv(df): return df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-       label="Download Full Results as CSV", data=convert_df_to_csv(st.session_state.results_df),
-       file_name="Verification_Results.csv", mime="text/csv",
-    )
-else: results_placeholder.info("Results will appear here once the process starts.")
-
-if st.session_state.process_running:
-    while not st.session_state.log_queue.empty(): st.session_state.log_messages.append(st.session_state.log_queue.get())
-    temp_results = []
-    while not st.session_state.results_queue.empty(): temp_results.append(st.session_state.results_queue.get())
-    if temp_results:
-        new_df = pd.DataFrame(temp_results)
-        st.session_state.results_df = pd.concat([st.session_state.results_df, new_df], ignore_index=True) if not st.session_state.results_df.empty else new_df
-    while not st.session_state.progress_queue.empty():
-        progress_update = st.session_state.progress_queue.get()
-        if progress_update[0] == 'done': 
-            st.session_state.process_running = False
-            st.rerun()
-        else: 
-            st.session_state.progress = progress_update
-    time.sleep(1)
-    st.rerun()
+
+st.sidebar.button(
+    "Start Verification", on_click=start_verification, args=(uploaded_file, selected_state, api_key),
+    disabled=not uploaded_file or not api_key or st.session_state.process_running,
+)
+st.sidebar.button("Stop Process", on_click=stop_verification, disabled=not st.session_state.process_running)
+
+st.sidebar.info(f"Up to {WORKERS} headless Chrome workers run in the background; no browser window will open.")
+
+# --- LIVE UPDATES ---
+def drain_queue(q, limit=QUEUE_DRAIN_LIMIT):
+    items = []
+    while limit is None or len(items) < limit:
+        try: items.append(q.popleft())
+        except IndexError: break
+    return items
+
+def poll_worker_queues():
+    """Moves pending worker output into session state. Returns True once the worker has finished."""
+    current_progress, total_progress, finished = st.session_state.progress_slot[0]
+    st.session_state.progress = (current_progress, total_progress)
+    # Once the worker is done nothing more arrives, so take everything that is left
+    limit = None if finished else QUEUE_DRAIN_LIMIT
+    st.session_state.log_messages.extend(drain_queue(st.session_state.log_queue, limit))
+    st.session_state.results_list.extend(drain_queue(st.session_state.results_queue, limit))
+    return finished
+
+def results_frame(results_list):
+    """Results in upload order; rows finish out of order across workers and duplicates are published with their first copy."""
+    return pd.DataFrame(results_list).sort_values('_row', kind='stable').drop(columns='_row').reset_index(drop=True)
+
+def get_results_csv():
+    """Encodes the results as CSV, re-encoding only when new rows have arrived since the last call."""
+    results_list = st.session_state.results_list
+    cached = st.session_state.get('results_csv')
+    if cached is None or cached[0] != len(results_list):
+        cached = (len(results_list), results_frame(results_list).to_csv(index=False).encode('utf-8'))
+        st.session_state.results_csv = cached
+    return cached[1]
+
+# Only this fragment re-executes while a run is in progress, not the whole script
+@st.fragment(run_every=1.0 if st.session_state.process_running else None)
+def live_dashboard():
+    if st.session_state.process_running and poll_worker_queues():
+        st.session_state.process_running = False
+        st.rerun()
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.subheader("📊 Progress")
+        current_progress, total_progress = st.session_state.progress
+        progress_bar = st.progress(0)
+        progress_text = st.empty()
+        if total_progress > 0:
+            percent_complete = int((current_progress / total_progress) * 100) if total_progress > 0 else 0
+            progress_bar.progress(percent_complete)
+            progress_text.text(f"Processed {current_progress} of {total_progress} ({percent_complete}%)")
+        else: progress_text.text("Waiting to start...")
+
+    with col2:
+        st.subheader("📝 Activity Log")
+        log_placeholder = st.empty()
+        with log_placeholder.container(height=300):
+            for msg in reversed(st.session_state.log_messages):
+                st.write(msg)
+
+    st.divider()
+    st.subheader("✅ Results")
+    results_placeholder = st.empty()
+    if st.session_state.results_list:
+        # Results are kept as plain dicts and only turned into a DataFrame for rendering
+        results_df = results_frame(st.session_state.results_list)
+        # Display only a subset of columns for a cleaner UI
+        display_cols = ['Name', 'State', 'Firm Name', 'Verified Status', 'Discipline Found', 'Comments', 'Profile Link', 'Unmatched Profile Links']
+        display_df = results_df[[col for col in display_cols if col in results_df.columns]]
+        results_placeholder.dataframe(display_df)
+        
+        st.download_button(
+           label="Download Full Results as CSV", data=get_results_csv(),
+           file_name="Verification_Results.csv", mime="text/csv",
+        )
+    else: results_placeholder.info("Results will appear here once the process starts.")
+
+live_dashboard()